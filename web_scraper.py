@@ -1,16 +1,36 @@
 # Note: Run pip install in a separate cell with !pip or %pip
-# !pip install requests beautifulsoup4
+# !pip install requests beautifulsoup4 lxml selectolax requests-cache aiohttp
 
 import argparse
+import asyncio
 import json
 import re
 import sys
 import textwrap
-from typing import List, Dict, Optional
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Dict, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
 
 import requests
 from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+from requests.adapters import HTTPAdapter
+from selectolax.lexbor import LexborHTMLParser
+
+try:
+    import requests_cache
+except ImportError:  # optional, only needed for --cache
+    requests_cache = None
+
+try:
+    import aiohttp
+except ImportError:  # optional, only needed for --async
+    aiohttp = None
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib json module
+    orjson = None
 
 DEFAULT_USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -18,75 +38,159 @@ DEFAULT_USER_AGENT = (
     "Chrome/117.0.0.0 Safari/537.36"
 )
 
+# Pages are truncated to this many (decoded) bytes before parsing
+MAX_BODY_BYTES = 2 * 1024 * 1024
+
+_BASE_HEADERS = {"User-Agent": DEFAULT_USER_AGENT, "Accept-Language": "en-US,en;q=0.9"}
+
+def _configure_session(session: requests.Session) -> requests.Session:
+    session.headers.update(_BASE_HEADERS)
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+# Shared session so repeated requests to the same host reuse keep-alive connections
+_SESSION = _configure_session(requests.Session())
+
+_RATING_RE = re.compile(r"([0-9]+(\.[0-9]+)?)/10|([0-9]+(\.[0-9]+)?)(?: out of 10)")
+# Year and duration share one pattern so the text is scanned in a single pass
+_YEAR_DUR_RE = re.compile(r"(?P<year>19\d{2}|20\d{2})|(?P<dur>\d{1,3}\s?min)", re.I)
+# Detail pages are scanned from the top; year/duration almost always appear in the first few KB
+_HEAD_SCAN_CHARS = 10_000
+
+# Selectors are tried in priority order; the first one that matches wins
+_BLOCK_SELECTORS = (
+    "div.movie-item",
+    "article.movie",
+    "li.movie",
+    "div.movie",
+    "div[class*='movie']",
+    "article",
+    "li",
+)
+_TITLE_SELECTORS = (".movie-title", "h2", "h3", "a.title", "a", ".title")
+_RATING_SELECTORS = (".movie-rating", ".rating", ".score", "span[class*='rating']", "div[class*='rating']")
+_HEADING_SELECTOR = "h1, h2, h3, h4, h5, h6"
+# Lexbor's text() includes script/style contents (BeautifulSoup's get_text() did not), so drop them up front
+_NON_TEXT_TAGS = ["script", "style"]
+
+def _is_cacheable(response: requests.Response) -> bool:
+    # Caching reads the whole decoded body into memory, so only allow responses known to fit under
+    # the cap. Content-Length is the on-the-wire size, so it only bounds the body when uncompressed.
+    if response.headers.get("Content-Encoding", "identity").strip().lower() != "identity":
+        return False
+    length = response.headers.get("Content-Length")
+    return length is not None and length.isdigit() and int(length) <= MAX_BODY_BYTES
+
+def enable_cache(cache_name: str = "scrape_cache", expire_after: int = 3600) -> bool:
+    """Swap the shared session for an on-disk SQLite cached session.
+
+    Returns False (and leaves the plain session in place) if requests-cache is not installed.
+    """
+    global _SESSION
+    if requests_cache is None:
+        return False
+    _SESSION = _configure_session(requests_cache.CachedSession(
+        cache_name, backend="sqlite", expire_after=expire_after, cache_control=True,
+        filter_fn=_is_cacheable,
+    ))
+    # Ask for uncompressed bodies so Content-Length is a real size bound and pages stay cacheable
+    _SESSION.headers["Accept-Encoding"] = "identity"
+    return True
+
+def _fetch_body(url: str, timeout: int = 10, headers: dict = None) -> bytes:
+    """Stream the response body for url, stopping once MAX_BODY_BYTES have been read."""
+    resp = _SESSION.get(url, headers=headers, timeout=timeout, stream=True)
+    try:
+        resp.raise_for_status()
+        chunks = []
+        size = 0
+        for chunk in resp.iter_content(chunk_size=64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_BODY_BYTES:
+                break
+        return b"".join(chunks)[:MAX_BODY_BYTES]
+    finally:
+        resp.close()
+
+def _select_descendant(node, selector: str):
+    """Like node.css_first, but never returns node itself (lexbor includes it in the match set)."""
+    for el in node.css(selector):
+        if el.mem_id != node.mem_id:
+            return el
+    return None
+
+def _first_text(node, selectors) -> Optional[str]:
+    """Return the text of the first selector (in priority order) whose first match has any text."""
+    for sel in selectors:
+        el = _select_descendant(node, sel)
+        txt = el.text(strip=True) if el else ""
+        if txt:
+            return txt
+    return None
+
 def scrape_movies(url: str, timeout: int = 10, headers: dict = None) -> List[Dict[str, str]]:
-    """Scrape movie summaries (title, rating, link, snippet, raw_html) from the given URL.
+    """Scrape movie summaries (title, rating, link, snippet, parsed node) from the given URL.
 
     Returns a list of dicts. Always returns a list (empty if nothing found).
     """
-    if headers is None:
-        headers = {"User-Agent": DEFAULT_USER_AGENT, "Accept-Language": "en-US,en;q=0.9"}
-
     try:
-        resp = requests.get(url, headers=headers, timeout=timeout)
-        resp.raise_for_status()
+        body = _fetch_body(url, timeout=timeout, headers=headers)
     except requests.exceptions.RequestException as e:
         print(f"Request error: {e}", file=sys.stderr)
         return []
 
-    soup = BeautifulSoup(resp.content, "html.parser")
+    return _parse_movies(body, url)
 
-    # Try several likely selectors for movie blocks
-    selectors = [
-        "div.movie-item",
-        "article.movie",
-        "li.movie",
-        "div.movie",
-        "div[class*='movie']",
-        "article",
-        "li",
-    ]
+def _parse_movies(body: bytes, url: str) -> List[Dict[str, str]]:
+    """Extract movie dicts from an index page body; url is used to resolve relative links."""
+    # Lexbor assumes UTF-8 bytes, so decode first using the BOM/<meta charset> or a detected encoding
+    tree = LexborHTMLParser(UnicodeDammit(body, is_html=True).unicode_markup)
+    tree.strip_tags(_NON_TEXT_TAGS, recursive=True)
 
+    # Try several likely selectors for movie blocks
     movie_listings = []
-    for sel in selectors:
-        found = soup.select(sel)
+    for sel in _BLOCK_SELECTORS:
+        found = tree.css(sel)
         if found:
             movie_listings = found
             break
 
     if not movie_listings:
-        headings = soup.find_all(re.compile(r"^h[1-6]$"))
+        headings = tree.css(_HEADING_SELECTOR)
         candidates = []
+        seen = set()
         for h in headings:
-            parent = h.find_parent()
-            if parent and parent not in candidates:
+            parent = h.parent
+            # Nodes are fresh wrappers on every access, so compare by underlying address
+            if parent is not None and parent.mem_id not in seen:
+                seen.add(parent.mem_id)
                 candidates.append(parent)
         movie_listings = candidates
 
+    # Resolve the common absolute-path hrefs without re-parsing the base URL per movie
+    base = urlsplit(url)
+    base_origin = f"{base.scheme}://{base.netloc}"
+
     movies_data = []
     for movie in movie_listings:
-        title = None
-        title_selectors = [".movie-title", "h2", "h3", "a.title", "a", ".title"]
-        for ts in title_selectors:
-            t_el = movie.select_one(ts)
-            if t_el and t_el.get_text(strip=True):
-                title = t_el.get_text(strip=True)
-                break
+        # Full block text is only needed by the fallbacks; extract it at most once
+        block_text = None
+
+        title = _first_text(movie, _TITLE_SELECTORS)
 
         if not title:
-            text = movie.get_text(separator=" ", strip=True)
-            title = text.split("\n")[0].strip() if text else "N/A"
-
-        rating = None
-        rating_selectors = [".movie-rating", ".rating", ".score", "span[class*='rating']", "div[class*='rating']"]
-        for rs in rating_selectors:
-            r_el = movie.select_one(rs)
-            if r_el and r_el.get_text(strip=True):
-                rating = r_el.get_text(strip=True)
-                break
+            block_text = movie.text(separator=" ", strip=True)
+            title = block_text.split("\n")[0].strip() if block_text else "N/A"
+
+        rating = _first_text(movie, _RATING_SELECTORS)
 
         if not rating:
-            text = movie.get_text(separator=" ", strip=True)
-            m = re.search(r"([0-9]+(\.[0-9]+)?)/10|([0-9]+(\.[0-9]+)?)(?: out of 10)", text)
+            if block_text is None:
+                block_text = movie.text(separator=" ", strip=True)
+            m = _RATING_RE.search(block_text)
             if m:
                 rating = m.group(0)
         if not rating:
@@ -94,44 +198,115 @@ def scrape_movies(url: str, timeout: int = 10, headers: dict = None) -> List[Dic
 
         # Link heuristics
         link = None
-        a = movie.select_one("a[href]")
-        if a and a.get("href"):
-            link = urljoin(url, a.get("href"))
+        a = _select_descendant(movie, "a[href]")
+        href = a.attributes.get("href") if a else None
+        if href:
+            if href.startswith(("http://", "https://")):
+                link = href
+            elif href.startswith("/") and not href.startswith("//") and "/." not in href:
+                # Dot segments ("/./", "/../") still need urljoin's normalisation
+                link = base_origin + href
+            else:
+                link = urljoin(url, href)
 
         # Snippet: first paragraph or short text
-        snippet = None
-        p = movie.find("p")
-        if p and p.get_text(strip=True):
-            snippet = p.get_text(strip=True)
-        else:
-            text = movie.get_text(separator=" ", strip=True)
-            snippet = text[:300] + ("..." if len(text) > 300 else "") if text else ""
+        p = _select_descendant(movie, "p")
+        snippet = p.text(strip=True) if p else None
+        if not snippet:
+            if block_text is None:
+                block_text = movie.text(separator=" ", strip=True)
+            snippet = block_text[:300] + ("..." if len(block_text) > 300 else "") if block_text else ""
 
         movies_data.append({
             "Title": title or "N/A",
             "Rating": rating,
             "Link": link,
             "Snippet": snippet or "",
-            "RawHTML": str(movie),
+            "_Node": movie,
         })
 
     return movies_data
 
+async def _fetch_body_async(session, url: str) -> bytes:
+    """aiohttp counterpart of _fetch_body, with the same MAX_BODY_BYTES cap."""
+    async with session.get(url) as resp:
+        resp.raise_for_status()
+        chunks = []
+        size = 0
+        async for chunk in resp.content.iter_chunked(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= MAX_BODY_BYTES:
+                break
+        return b"".join(chunks)[:MAX_BODY_BYTES]
+
+async def scrape_movies_async(urls: List[str], timeout: int = 10) -> List[List[Dict[str, str]]]:
+    """Scrape several index pages concurrently with aiohttp.
+
+    Returns one list of movie dicts per URL, in the same order; a failed URL yields an empty list.
+    """
+    if aiohttp is None:
+        raise ImportError("scrape_movies_async requires aiohttp (pip install aiohttp)")
+    connector = aiohttp.TCPConnector(limit=50, ttl_dns_cache=300)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers=_BASE_HEADERS,
+        timeout=aiohttp.ClientTimeout(total=timeout),
+    ) as session:
+        bodies = await asyncio.gather(*[_fetch_body_async(session, u) for u in urls], return_exceptions=True)
+
+    results = []
+    for url, body in zip(urls, bodies):
+        if isinstance(body, (aiohttp.ClientError, asyncio.TimeoutError)):
+            print(f"Request error: {body}", file=sys.stderr)
+            results.append([])
+        elif isinstance(body, BaseException):
+            raise body
+        else:
+            results.append(_parse_movies(body, url))
+    return results
+
+def _find_year_and_duration(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return the first year and first duration found in text, stopping once both are seen."""
+    year = None
+    duration = None
+    for m in _YEAR_DUR_RE.finditer(text):
+        if m.group("year"):
+            year = year or m.group("year")
+        elif duration is None:
+            duration = m.group("dur")
+        if year and duration:
+            break
+    return year, duration
+
+def _find_year_and_duration_in_strings(strings: Iterable[str]) -> Tuple[Optional[str], Optional[str]]:
+    """Scan strings in order, stopping once both values are found or _HEAD_SCAN_CHARS of text have been seen."""
+    year = None
+    duration = None
+    prev = ""
+    size = 0
+    for s in strings:
+        # Prepend the previous string so a value split across two strings (e.g. "95", "min") still matches
+        found_year, found_duration = _find_year_and_duration(f"{prev} {s}" if prev else s)
+        year = year or found_year
+        duration = duration or found_duration
+        size += len(s) + 1
+        if (year and duration) or size >= _HEAD_SCAN_CHARS:
+            break
+        prev = s
+    return year, duration
+
 def fetch_movie_details_from_page(url: str, timeout: int = 10, headers: dict = None) -> Dict[str, Optional[str]]:
     """Fetch additional details from a movie detail page (if available).
 
     Returns a dict with keys like Summary, Year, Duration, Additional.
     """
-    if headers is None:
-        headers = {"User-Agent": DEFAULT_USER_AGENT}
-
     try:
-        resp = requests.get(url, headers=headers, timeout=timeout)
-        resp.raise_for_status()
+        body = _fetch_body(url, timeout=timeout, headers=headers)
     except requests.exceptions.RequestException:
         return {"Summary": None, "Year": None, "Duration": None, "Additional": None}
 
-    soup = BeautifulSoup(resp.content, "html.parser")
+    soup = BeautifulSoup(body, "lxml")
     # Summary: first meaningful paragraph
     summary = None
     for p in soup.find_all("p"):
@@ -140,37 +315,39 @@ def fetch_movie_details_from_page(url: str, timeout: int = 10, headers: dict = N
             summary = t
             break
 
-    full_text = soup.get_text(separator=" ", strip=True)
-    year = None
-    m = re.search(r"(19\d{2}|20\d{2})", full_text)
-    if m:
-        year = m.group(0)
-
-    duration = None
-    m2 = re.search(r"(\d{1,3})\s?min|(\d{1,3})\s?minutes", full_text, re.I)
-    if m2:
-        duration = m2.group(0)
+    year, duration = _find_year_and_duration_in_strings(soup.stripped_strings)
 
     return {"Summary": summary, "Year": year, "Duration": duration, "Additional": None}
 
-def extract_details_from_rawhtml(raw_html: str) -> Dict[str, Optional[str]]:
-    soup = BeautifulSoup(raw_html, "html.parser")
-    # try similar extraction as detail page
+def extract_details_from_node(node) -> Dict[str, Optional[str]]:
+    # try similar extraction as detail page, directly on the already parsed block
+    node.strip_tags(_NON_TEXT_TAGS, recursive=True)
     summary = None
-    p = soup.find("p")
-    if p and p.get_text(strip=True):
-        summary = p.get_text(strip=True)
-    full_text = soup.get_text(separator=" ", strip=True)
-    year = None
-    m = re.search(r"(19\d{2}|20\d{2})", full_text)
-    if m:
-        year = m.group(0)
-    duration = None
-    m2 = re.search(r"(\d{1,3})\s?min|(\d{1,3})\s?minutes", full_text, re.I)
-    if m2:
-        duration = m2.group(0)
+    p = node.css_first("p")
+    if p:
+        summary = p.text(strip=True) or None
+    full_text = node.text(separator=" ", strip=True)
+    year, duration = _find_year_and_duration(full_text)
     return {"Summary": summary, "Year": year, "Duration": duration, "Additional": None}
 
+def extract_details_from_rawhtml(raw_html: str) -> Dict[str, Optional[str]]:
+    # fallback for movie dicts that only carry HTML (e.g. built outside scrape_movies)
+    return extract_details_from_node(LexborHTMLParser(raw_html).body)
+
+def prefetch_details(movies: List[Dict[str, str]], max_workers: int = 8) -> None:
+    """Fetch detail pages for all linked movies concurrently.
+
+    Results are attached to each movie dict under "_Details" so the interactive
+    menu can show them without another request.
+    """
+    linked = [m for m in movies if m.get("Link")]
+    if not linked:
+        return
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(lambda m: fetch_movie_details_from_page(m["Link"]), linked))
+    for m, details in zip(linked, results):
+        m["_Details"] = details
+
 def interactive_menu(movies: List[Dict[str, str]], base_url: str):
     if not movies:
         print("No movies to display.")
@@ -205,11 +382,16 @@ def interactive_menu(movies: List[Dict[str, str]], base_url: str):
             selected = movies[idx - 1]
             print(f"\n--- Details for: {selected['Title']} ---")
 
-            if selected.get("Link"):
+            if selected.get("_Details") is not None:
+                details = selected["_Details"]
+                print(f"Link: {selected['Link']}")
+            elif selected.get("Link"):
                 details = fetch_movie_details_from_page(selected["Link"]) or {}
                 print(f"Link: {selected['Link']}")
+            elif selected.get("_Node") is not None:
+                details = extract_details_from_node(selected["_Node"])
             else:
-                details = extract_details_from_rawhtml(selected.get("RawHTML",""))
+                details = extract_details_from_rawhtml(selected.get("RawHTML", ""))
 
             print(f"Rating: {selected.get('Rating','N/A')}")
             if details.get("Year"):
@@ -231,11 +413,24 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Simple movie web scraper with interactive details")
     parser.add_argument("url", nargs="?", default="http://publicdomainmovie.net/", help="Target URL to scrape")
     parser.add_argument("--json", "-j", help="Path to save results as JSON")
+    parser.add_argument("--prefetch", action="store_true", help="Fetch all detail pages concurrently before showing the menu (ignored when not interactive)")
+    parser.add_argument("--cache", action=argparse.BooleanOptionalAction, default=False, help="Cache HTTP responses on disk for an hour (requests uncompressed pages; only those with a Content-Length under the size cap are cached)")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Fetch the index page with aiohttp (bypasses --cache)")
     parser.add_argument("--no-interactive", action="store_true", help="Do not prompt for movie selection even if interactive")
     args = parser.parse_args()
 
+    if args.cache and not enable_cache():
+        print("requests-cache is not installed; continuing without a cache.", file=sys.stderr)
+
+    if args.use_async and aiohttp is None:
+        print("aiohttp is not installed; falling back to requests.", file=sys.stderr)
+        args.use_async = False
+
     print(f"Scraping data from: {args.url}")
-    scraped = scrape_movies(args.url)
+    if args.use_async:
+        scraped = asyncio.run(scrape_movies_async([args.url]))[0]
+    else:
+        scraped = scrape_movies(args.url)
 
     if not scraped:
         print("No movie data found or an error occurred.")
@@ -246,16 +441,23 @@ if __name__ == "__main__":
         print(f"{i}. Title: {movie['Title']}, Rating: {movie['Rating']}")
 
     if args.json:
-        # Save a JSON-serializable version (omit RawHTML if desired)
+        # Save a JSON-serializable version (omit internal "_" keys such as the parsed node)
         try:
-            serializable = [ {k: v for k, v in m.items() if k != 'RawHTML'} for m in scraped ]
-            with open(args.json, "w", encoding="utf-8") as f:
-                json.dump(serializable, f, ensure_ascii=False, indent=2)
+            serializable = [ {k: v for k, v in m.items() if not k.startswith('_')} for m in scraped ]
+            if orjson is not None:
+                with open(args.json, "wb") as f:
+                    f.write(orjson.dumps(serializable, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(args.json, "w", encoding="utf-8") as f:
+                    json.dump(serializable, f, ensure_ascii=False, indent=2)
             print(f"Results written to {args.json}")
         except OSError as e:
             print(f"Failed to write JSON file: {e}", file=sys.stderr)
 
     if not args.no_interactive and sys.stdin.isatty():
+        # Prefetched details are only read by the menu, so skip the requests otherwise
+        if args.prefetch:
+            prefetch_details(scraped)
         interactive_menu(scraped, args.url)
 
     print("Done.")
\ No newline at end of file